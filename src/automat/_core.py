@@ -8,8 +8,17 @@ Perhaps something that could be replaced with or integrated into machinist.
 from __future__ import annotations
 
 import sys
-from itertools import chain
-from typing import Callable, Generic, Optional, Sequence, TypeVar, Hashable
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Generic,
+    Hashable,
+    Iterable,
+    Optional,
+    Sequence,
+    TypeVar,
+)
 
 if sys.version_info >= (3, 10):
     from typing import TypeAlias
@@ -42,9 +51,12 @@ class NoTransition(Exception, Generic[State, Input]):
         """
         self.state = state
         self.symbol = symbol
-        super(Exception, self).__init__(
-            "no transition for {} in {}".format(symbol, state)
-        )
+        # Formatting the message is left to __str__, since callers that
+        # catch this exception often never look at it.
+        super(Exception, self).__init__(state, symbol)
+
+    def __str__(self) -> str:
+        return "no transition for {} in {}".format(self.symbol, self.state)
 
 
 class Automaton(Generic[State, Input, Output]):
@@ -54,6 +66,25 @@ class Automaton(Generic[State, Input, Output]):
     Note that this is not the machine itself; it is immutable.
     """
 
+    __slots__ = (
+        "_initialState",
+        "_transitions",
+        "_transitionMap",
+        "_unhandledTransition",
+        "_inputs",
+        "_outputs",
+        "_statesSeen",
+        "_transitionsFrozen",
+        "_inputsFrozen",
+        "_outputsFrozen",
+        "_statesFrozen",
+        "_stateIndex",
+        "_indexedStates",
+        "_inputIndex",
+        "_indexedInputs",
+        "_table",
+    )
+
     def __init__(self, initial: State | None = None) -> None:
         """
         Initialize the set of transitions and the initial state.
@@ -62,8 +93,34 @@ class Automaton(Generic[State, Input, Output]):
             initial = _NO_STATE  # type:ignore[assignment]
         assert initial is not None
         self._initialState: State = initial
-        self._transitions: set[tuple[State, Input, State, Sequence[Output]]] = set()
+        self._transitions: list[tuple[State, Input, State, Sequence[Output]]] = []
+        self._transitionMap: dict[
+            tuple[State, Input], tuple[State, tuple[Output, ...]]
+        ] = {}
         self._unhandledTransition: Optional[tuple[State, Sequence[Output]]] = None
+        self._inputs: set[Input] = set()
+        self._outputs: set[Output] = set()
+        self._statesSeen: set[State] = set()
+        self._transitionsFrozen: (
+            frozenset[tuple[State, Input, State, Sequence[Output]]] | None
+        ) = None
+        self._inputsFrozen: frozenset[Input] | None = None
+        self._outputsFrozen: frozenset[Output] | None = None
+        self._statesFrozen: frozenset[State] | None = None
+        # States and inputs are numbered in the order they are first seen, and
+        # keep their number forever, so that a Transitioner can track its state
+        # (and callers can identify their inputs) as indexes into the dispatch
+        # table, even if more transitions are added.  Only the initial state
+        # and states that appear in transitions are numbered, and only while
+        # the automaton is being declared; see L{Transitioner._state} for the
+        # others.
+        self._stateIndex: dict[State, int] = {}
+        self._indexedStates: list[State] = []
+        self._inputIndex: dict[Input, int] = {}
+        self._indexedInputs: list[Input] = []
+        self._table: list[list[tuple[int, tuple[Output, ...]] | None]] | None = None
+        if initial is not _NO_STATE:
+            self._indexOf(initial)
 
     @property
     def initialState(self) -> State:
@@ -85,6 +142,7 @@ class Automaton(Generic[State, Input, Output]):
             )
 
         self._initialState = state
+        self._indexOf(state)
 
     def addTransition(
         self,
@@ -97,17 +155,73 @@ class Automaton(Generic[State, Input, Output]):
         Add the given transition to the outputSymbol. Raise ValueError if
         there is already a transition with the same inState and inputSymbol.
         """
-        # keeping self._transitions in a flat list makes addTransition
-        # O(n^2), but state machines don't tend to have hundreds of
-        # transitions.
-        for anInState, anInputSymbol, anOutState, _ in self._transitions:
-            if anInState == inState and anInputSymbol == inputSymbol:
+        key = (inState, inputSymbol)
+        existing = self._transitionMap.get(key)
+        if existing is not None:
+            raise ValueError(
+                "already have transition from {} to {} via {}".format(
+                    inState, existing[0], inputSymbol
+                )
+            )
+        outputs = (
+            outputSymbols if type(outputSymbols) is tuple else tuple(outputSymbols)
+        )
+        self._recordTransition(inState, inputSymbol, outState, outputs)
+        self._transitionsAdded()
+
+    def addTransitions(
+        self, transitions: Iterable[tuple[State, Input, State, Sequence[Output]]]
+    ) -> None:
+        """
+        Add several transitions at once, as with L{addTransition}.  Raise
+        ValueError, and add none of them, if any of them has the same inState
+        and inputSymbol as an existing transition or as another one of
+        C{transitions}.
+        """
+        pending: dict[tuple[State, Input], tuple[State, tuple[Output, ...]]] = {}
+        for inState, inputSymbol, outState, outputSymbols in transitions:
+            key = (inState, inputSymbol)
+            existing = self._transitionMap.get(key) or pending.get(key)
+            if existing is not None:
                 raise ValueError(
                     "already have transition from {} to {} via {}".format(
-                        inState, anOutState, inputSymbol
+                        inState, existing[0], inputSymbol
                     )
                 )
-        self._transitions.add((inState, inputSymbol, outState, tuple(outputSymbols)))
+            pending[key] = (outState, tuple(outputSymbols))
+        for (inState, inputSymbol), (outState, outputs) in pending.items():
+            self._recordTransition(inState, inputSymbol, outState, outputs)
+        if pending:
+            self._transitionsAdded()
+
+    def _recordTransition(
+        self,
+        inState: State,
+        inputSymbol: Input,
+        outState: State,
+        outputs: tuple[Output, ...],
+    ) -> None:
+        """
+        Add a transition that is already known not to be a duplicate, without
+        invalidating any derived state; see L{_transitionsAdded}.
+        """
+        self._transitionMap[(inState, inputSymbol)] = (outState, outputs)
+        self._transitions.append((inState, inputSymbol, outState, outputs))
+        self._inputs.add(inputSymbol)
+        self._outputs.update(outputs)
+        self._statesSeen.update((inState, outState))
+        self._indexOf(inState)
+        self._indexOf(outState)
+        self._inputIndexOf(inputSymbol)
+
+    def _transitionsAdded(self) -> None:
+        """
+        Discard the frozen alphabets and the dispatch table after adding
+        transitions, so that they are rebuilt when next needed.
+        """
+        self._transitionsFrozen = None
+        self._inputsFrozen = self._outputsFrozen = self._statesFrozen = None
+        self._table = None
 
     def unhandledTransition(
         self, outState: State, outputSymbols: Sequence[Output]
@@ -122,39 +236,34 @@ class Automaton(Generic[State, Input, Output]):
         """
         All transitions.
         """
-        return frozenset(self._transitions)
+        if self._transitionsFrozen is None:
+            self._transitionsFrozen = frozenset(self._transitions)
+        return self._transitionsFrozen
 
-    def inputAlphabet(self) -> set[Input]:
+    def inputAlphabet(self) -> frozenset[Input]:
         """
         The full set of symbols acceptable to this automaton.
         """
-        return {
-            inputSymbol
-            for (inState, inputSymbol, outState, outputSymbol) in self._transitions
-        }
+        if self._inputsFrozen is None:
+            self._inputsFrozen = frozenset(self._inputs)
+        return self._inputsFrozen
 
-    def outputAlphabet(self) -> set[Output]:
+    def outputAlphabet(self) -> frozenset[Output]:
         """
         The full set of symbols which can be produced by this automaton.
         """
-        return set(
-            chain.from_iterable(
-                outputSymbols
-                for (inState, inputSymbol, outState, outputSymbols) in self._transitions
-            )
-        )
+        if self._outputsFrozen is None:
+            self._outputsFrozen = frozenset(self._outputs)
+        return self._outputsFrozen
 
     def states(self) -> frozenset[State]:
         """
         All valid states; "Q" in the mathematical description of a state
         machine.
         """
-        return frozenset(
-            chain.from_iterable(
-                (inState, outState)
-                for (inState, inputSymbol, outState, outputSymbol) in self._transitions
-            )
-        )
+        if self._statesFrozen is None:
+            self._statesFrozen = frozenset(self._statesSeen)
+        return self._statesFrozen
 
     def outputForInput(
         self, inState: State, inputSymbol: Input
@@ -162,13 +271,72 @@ class Automaton(Generic[State, Input, Output]):
         """
         A 2-tuple of (outState, outputSymbols) for inputSymbol.
         """
-        for anInState, anInputSymbol, outState, outputSymbols in self._transitions:
-            if (inState, inputSymbol) == (anInState, anInputSymbol):
-                return (outState, list(outputSymbols))
+        transition = self._transitionMap.get((inState, inputSymbol))
+        if transition is not None:
+            return transition
         if self._unhandledTransition is None:
             raise NoTransition(state=inState, symbol=inputSymbol)
         return self._unhandledTransition
 
+    def _indexOf(self, state: State) -> int:
+        """
+        Get the number of the given state in the dispatch table, assigning it
+        the next available one if it doesn't have one yet.
+
+        This is only for declaring the automaton; a L{Transitioner} never
+        numbers states.
+        """
+        index = self._stateIndex.get(state)
+        if index is None:
+            index = self._stateIndex[state] = len(self._indexedStates)
+            self._indexedStates.append(state)
+            self._table = None
+        return index
+
+    def _inputIndexOf(self, inputSymbol: Input) -> int:
+        """
+        Get the number of the given input symbol in the dispatch table,
+        assigning it the next available one if it doesn't have one yet.
+        """
+        index = self._inputIndex.get(inputSymbol)
+        if index is None:
+            index = self._inputIndex[inputSymbol] = len(self._indexedInputs)
+            self._indexedInputs.append(inputSymbol)
+            self._table = None
+        return index
+
+    def _dispatchTable(self) -> list[list[tuple[int, tuple[Output, ...]] | None]]:
+        """
+        Get a table, indexed by state number and then input number, of the
+        number of the state each transition leads to and the outputs it
+        produces, or C{None} where there is no transition.  It is compiled
+        from the transitions the first time it is needed and kept until
+        another transition is added.
+
+        The table has one more row than there are numbered states, with no
+        transitions in it, so that L{_UNNUMBERED} (-1) finds that row.
+        """
+        if self._table is None:
+            width = len(self._indexedInputs)
+            table: list[list[tuple[int, tuple[Output, ...]] | None]] = [
+                [None] * width for each in range(len(self._indexedStates) + 1)
+            ]
+            stateIndex = self._stateIndex
+            inputIndex = self._inputIndex
+            for (inState, inputSymbol), transition in self._transitionMap.items():
+                outState, outputSymbols = transition
+                table[stateIndex[inState]][inputIndex[inputSymbol]] = (
+                    stateIndex[outState],
+                    outputSymbols,
+                )
+            self._table = table
+        return self._table
+
+
+# The state index of a Transitioner whose state the automaton hasn't numbered;
+# it finds the empty last row of the dispatch table, so every input goes to
+# Transitioner._lookUpTransition.
+_UNNUMBERED = -1
 
 OutputTracer = Callable[[Output], None]
 Tracer: TypeAlias = "Callable[[State, Input, State], OutputTracer[Output] | None]"
@@ -179,13 +347,49 @@ class Transitioner(Generic[State, Input, Output]):
     The combination of a current state and an L{Automaton}.
     """
 
+    __slots__ = ("_automaton", "_stateIndex", "_unnumberedState", "_tracer")
+
     def __init__(self, automaton: Automaton[State, Input, Output], initialState: State):
         self._automaton: Automaton[State, Input, Output] = automaton
-        self._state: State = initialState
+        self._stateIndex: int
+        self._unnumberedState: State | None
+        self._state = initialState
         self._tracer: Tracer[State, Input, Output] | None = None
 
+    @property
+    def _state(self) -> State:
+        """
+        The current state.
+        """
+        index = self._stateIndex
+        if index == _UNNUMBERED:
+            return self._unnumberedState  # type:ignore[return-value]
+        return self._automaton._indexedStates[index]
+
+    @_state.setter
+    def _state(self, state: State) -> None:
+        # A state that no transition mentions (an unhandled-transition target,
+        # or an unserialized state, for example) has no row in the dispatch
+        # table; keep it here rather than adding it to the automaton, which
+        # may be shared with other threads.
+        index = self._automaton._stateIndex.get(state)
+        if index is None:
+            self._unnumberedState = state
+            index = _UNNUMBERED
+        else:
+            self._unnumberedState = None
+        self._stateIndex = index
+
     def setTrace(self, tracer: Tracer[State, Input, Output] | None) -> None:
         self._tracer = tracer
+        # Only a tracing transitioner checks for a tracer on each transition.
+        cls = type(self)
+        self.__class__ = cls._untracedClass if tracer is None else cls._tracedClass
+
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        super().__init_subclass__(**kwargs)
+        if "_untracedClass" not in cls.__dict__:
+            _addTracedClass(cls)
 
     def transition(
         self, inputSymbol: Input
@@ -193,6 +397,47 @@ class Transitioner(Generic[State, Input, Output]):
         """
         Transition between states, returning any outputs.
         """
+        inputIndex = self._automaton._inputIndex.get(inputSymbol)
+        if inputIndex is None:
+            return self._lookUpTransition(inputSymbol)
+        return self._transitionByIndex(inputIndex)
+
+    def _transitionByIndex(
+        self, inputIndex: int
+    ) -> tuple[Sequence[Output], OutputTracer[Output] | None]:
+        """
+        Like L{Transitioner.transition}, but for the input symbol with the
+        given number in the automaton's dispatch table.
+        """
+        automaton = self._automaton
+        table = automaton._table
+        if table is None:
+            table = automaton._dispatchTable()
+        transition = table[self._stateIndex][inputIndex]
+        if transition is None:
+            return self._lookUpTransition(automaton._indexedInputs[inputIndex])
+        outIndex, outputSymbols = transition
+        self._stateIndex = outIndex
+        return (outputSymbols, None)
+
+    def _tracedTransitionByIndex(
+        self, inputIndex: int
+    ) -> tuple[Sequence[Output], OutputTracer[Output] | None]:
+        """
+        L{Transitioner._transitionByIndex} for a transitioner with a tracer;
+        see L{Transitioner.setTrace}.
+        """
+        return self._lookUpTransition(self._automaton._indexedInputs[inputIndex])
+
+    def _lookUpTransition(
+        self, inputSymbol: Input
+    ) -> tuple[Sequence[Output], OutputTracer[Output] | None]:
+        """
+        Transition for an input symbol by asking the automaton, rather than
+        using its dispatch table, which lets it raise L{NoTransition} or tell
+        us where to go for unhandled transitions; and report the transition
+        to the tracer, if there is one.
+        """
         outState, outputSymbols = self._automaton.outputForInput(
             self._state, inputSymbol
         )
@@ -201,3 +446,30 @@ class Transitioner(Generic[State, Input, Output]):
             outTracer = self._tracer(self._state, inputSymbol, outState)
         self._state = outState
         return (outputSymbols, outTracer)
+
+    _untracedClass: ClassVar[type[Transitioner[Any, Any, Any]]]
+    _tracedClass: ClassVar[type[Transitioner[Any, Any, Any]]]
+
+
+def _addTracedClass(cls: type[Transitioner[Any, Any, Any]]) -> None:
+    """
+    Give a L{Transitioner} class a subclass to switch to while it has a tracer,
+    which follows every transition through
+    L{Transitioner._lookUpTransition} so that it is reported.
+    """
+    traced = type(
+        f"_Tracing{cls.__name__}",
+        (cls,),
+        dict(
+            __slots__=(),
+            __module__=cls.__module__,
+            _untracedClass=cls,
+            _transitionByIndex=Transitioner._tracedTransitionByIndex,
+        ),
+    )
+    cls._untracedClass = cls
+    # The traced class inherits this, so setting a tracer again keeps it.
+    cls._tracedClass = traced
+
+
+_addTracedClass(Transitioner)
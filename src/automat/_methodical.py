@@ -7,6 +7,7 @@ from dataclasses import dataclass, field
 from functools import wraps
 from inspect import getfullargspec as getArgsSpec
 from itertools import count
+from types import MethodType
 from typing import Any, Callable, Hashable, Iterable, TypeVar
 
 if sys.version_info < (3, 10):
@@ -100,6 +101,15 @@ class MethodicalState(object):
     machine: MethodicalMachine = field(repr=False)
     method: Callable[..., Any] = field()
     serialized: bool = field(repr=False)
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # States are dictionary keys on every input, so only hash the fields
+        # once.
+        self.__dict__["_hash"] = hash((self.machine, self.method, self.serialized))
+
+    def __hash__(self) -> int:
+        return self._hash
 
     def upon(
         self,
@@ -206,34 +216,64 @@ def _filterArgs(args, kwargs, inputSpec, outputSpec):
     :return: The args and kwargs that output will accept.
     :rtype: Tuple[tuple, dict]
     """
-    named_args = tuple(zip(inputSpec.args[1:], args))
-    if outputSpec.varargs:
-        # Only return all args if the output accepts *args.
-        return_args = args
-    else:
-        # Filter out arguments that don't appear
-        # in the output's method signature.
-        return_args = [v for n, v in named_args if n in outputSpec.args]
-
-    # Get any of input's default arguments that were not passed.
-    passed_arg_names = tuple(kwargs)
-    for name, value in named_args:
-        passed_arg_names += (name, value)
-    defaults = zip(inputSpec.args[::-1], inputSpec.defaults[::-1])
-    full_kwargs = {n: v for n, v in defaults if n not in passed_arg_names}
-    full_kwargs.update(kwargs)
-
-    if outputSpec.varkw:
-        # Only pass all kwargs if the output method accepts **kwargs.
-        return_kwargs = full_kwargs
-    else:
-        # Filter out names that the output method does not accept.
-        all_accepted_names = outputSpec.args[1:] + outputSpec.kwonlyargs
-        return_kwargs = {
-            n: v for n, v in full_kwargs.items() if n in all_accepted_names
+    return _argFilter(inputSpec, outputSpec)(args, kwargs)
+
+
+def _argFilter(inputSpec, outputSpec):
+    """
+    Work out ahead of time how L{_filterArgs} treats arguments passed from a
+    particular input to a particular output.
+
+    :param ArgSpec inputSpec: The input's arg spec.
+    :param ArgSpec outputSpec: The output's arg spec.
+    :return: A function taking the *args and **kwargs that input received
+        and returning the args and kwargs that output will accept.
+    :rtype: Callable[[tuple, dict], Tuple[tuple, dict]]
+    """
+    inputNames = inputSpec.args[1:]
+    # Only pass all args if the output accepts *args; otherwise, pass those
+    # at the positions of input's arguments that appear in output's
+    # signature.
+    allArgs = bool(outputSpec.varargs)
+    positions = tuple(
+        position for position, name in enumerate(inputNames) if name in outputSpec.args
+    )
+    # Input's default arguments, along with the position each would be
+    # passed at; they're used unless passed positionally or by name.
+    firstDefault = len(inputNames) - len(inputSpec.defaults)
+    defaults = tuple(
+        (name, value, firstDefault + offset)
+        for offset, (name, value) in enumerate(
+            zip(inputNames[firstDefault:], inputSpec.defaults)
+        )
+    )[::-1]
+    # Only pass all kwargs if the output method accepts **kwargs; otherwise,
+    # filter out names that it does not accept.
+    acceptedNames = (
+        None
+        if outputSpec.varkw
+        else frozenset(outputSpec.args[1:] + outputSpec.kwonlyargs)
+    )
+
+    def filterArgs(args, kwargs):
+        passed = len(args)
+        if allArgs:
+            returnArgs = args
+        else:
+            returnArgs = [args[position] for position in positions if position < passed]
+        fullKwargs = {
+            name: value
+            for name, value, position in defaults
+            if position >= passed and name not in kwargs
+        }
+        fullKwargs.update(kwargs)
+        if acceptedNames is None:
+            return returnArgs, fullKwargs
+        return returnArgs, {
+            name: value for name, value in fullKwargs.items() if name in acceptedNames
         }
 
-    return return_args, return_kwargs
+    return filterArgs
 
 
 T = TypeVar("T")
@@ -251,42 +291,67 @@ class MethodicalInput(object):
     )
     method: Callable[..., Any] = field()
     symbol: str = field(repr=False)
-    collectors: dict[MethodicalState, Callable[[Iterable[T]], R]] = field(
+    # Keyed by the number of the state in the automaton's dispatch table.
+    collectors: dict[int, Callable[[Iterable[T]], R]] = field(
+        default_factory=dict, repr=False
+    )
+    argFilters: dict[MethodicalOutput, Callable[..., Any]] = field(
         default_factory=dict, repr=False
     )
 
     argSpec: ArgSpec = field(init=False, repr=False)
+    _function: Callable[..., object] = field(init=False, repr=False)
 
     def __post_init__(self) -> None:
         self.argSpec = _getArgSpec(self.method)
         assertNoCode(self.method)
+        self._function = self._inputFunction()
 
-    def __get__(self, oself: object, type: None = None) -> object:
+    def _inputFunction(self) -> Callable[..., object]:
         """
-        Return a function that takes no arguments and returns values returned
-        by output functions produced by the given L{MethodicalInput} in
-        C{oself}'s current state.
+        Create the function that implements this input, taking the instance
+        as its first argument, once; binding it to each instance in
+        L{MethodicalInput.__get__} is then cheap.
         """
-        transitioner = _transitionerFromInstance(oself, self.symbol, self.automaton)
-
-        @preserveName(self.method)
-        @wraps(self.method)
-        def doInput(*args: object, **kwargs: object) -> object:
-            self.method(oself, *args, **kwargs)
-            previousState = transitioner._state
-            (outputs, outTracer) = transitioner.transition(self)
-            collector = self.collectors[previousState]
+        symbol = self.symbol
+        automaton = self.automaton
+        method = self.method
+        collectors = self.collectors
+        argFilters = self.argFilters
+        # Dispatch straight to this input's column of the automaton's
+        # dispatch table, as typed machines do.
+        inputIndex = automaton._inputIndexOf(self)
+
+        @wraps(method)
+        @preserveName(method)
+        def doInput(oself: object, /, *args: object, **kwargs: object) -> object:
+            transitioner = _transitionerFromInstance(oself, symbol, automaton)
+            method(oself, *args, **kwargs)
+            previousState = transitioner._stateIndex
+            (outputs, outTracer) = transitioner._transitionByIndex(inputIndex)
+            collector = collectors[previousState]
             values = []
             for output in outputs:
                 if outTracer is not None:
                     outTracer(output)
-                a, k = _filterArgs(args, kwargs, self.argSpec, output.argSpec)
-                value = output(oself, *a, **k)
+                a, k = argFilters[output](args, kwargs)
+                # Equivalent to output(oself, *a, **k), minus a frame.
+                value = output.method(oself, *a, **k)
                 values.append(value)
             return collector(values)
 
         return doInput
 
+    def __get__(self, oself: object, type: None = None) -> object:
+        """
+        Return a function that takes no arguments and returns values returned
+        by output functions produced by the given L{MethodicalInput} in
+        C{oself}'s current state.
+        """
+        if oself is None:
+            return self._function
+        return MethodType(self._function, oself)
+
     def _name(self) -> str:
         return self.method.__name__
 
@@ -300,9 +365,15 @@ class MethodicalOutput(object):
     machine: MethodicalMachine = field(repr=False)
     method: Callable[..., Any]
     argSpec: ArgSpec = field(init=False, repr=False, compare=False)
+    _hash: int = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         self.__dict__["argSpec"] = _getArgSpec(self.method)
+        # Like states, outputs are dictionary keys on every input.
+        self.__dict__["_hash"] = hash((self.machine, self.method))
+
+    def __hash__(self) -> int:
+        return self._hash
 
     def __get__(self, oself, type=None):
         """
@@ -479,10 +550,13 @@ class MethodicalMachine(object):
         #     if not isinstance(endState, MethodicalState):
         #         raise NotImplementedError("output state {} isn't a state"
         #                                   .format(endState))
-        self._automaton.addTransition(
-            startState, inputToken, endState, tuple(outputTokens)
-        )
-        inputToken.collectors[startState] = collector
+        outputTokens = tuple(outputTokens)
+        self._automaton.addTransition(startState, inputToken, endState, outputTokens)
+        inputToken.collectors[self._automaton._indexOf(startState)] = collector
+        for output in outputTokens:
+            inputToken.argFilters[output] = _argFilter(
+                inputToken.argSpec, output.argSpec
+            )
 
     @_keywords_only
     def serializer(self):
@@ -8,6 +8,7 @@ from __future__ import annotations
 import sys
 
 from typing import TYPE_CHECKING, Callable, Protocol, TypeVar
+from weakref import WeakKeyDictionary
 
 from inspect import signature, Signature
 
@@ -20,14 +21,35 @@ def runtime_name(x: ProtocolAtRuntime[T]) -> str:
     return x.__name__
 
 
-from inspect import getmembers, isfunction
+from inspect import isfunction
+
+
+def _definedFunctions(klass: type) -> frozenset[str]:
+    """
+    Get the names of all the attributes of C{klass} that are plain functions,
+    honoring overrides in the usual method-resolution order.
+
+    This is what C{getmembers(klass, isfunction)} would find, without sorting
+    C{dir(klass)} and invoking every descriptor along the way.
+    """
+    seen: set[str] = set()
+    functions = set()
+    for each in klass.__mro__:
+        for name, value in vars(each).items():
+            if name in seen:
+                continue
+            seen.add(name)
+            if isfunction(value):
+                functions.add(name)
+    return frozenset(functions)
+
 
 emptyProtocolMethods: frozenset[str]
 if not TYPE_CHECKING:
-    emptyProtocolMethods = frozenset(
-        name
-        for name, each in getmembers(type("Example", tuple([Protocol]), {}), isfunction)
-    )
+    emptyProtocolMethods = _definedFunctions(type("Example", tuple([Protocol]), {}))
+
+
+_protocolMethodCache: WeakKeyDictionary[object, frozenset[str]] = WeakKeyDictionary()
 
 
 def actuallyDefinedProtocolMethods(protocol: object) -> frozenset[str]:
@@ -37,26 +59,60 @@ def actuallyDefinedProtocolMethods(protocol: object) -> frozenset[str]:
 
     that includes locally defined methods and also those defined in inherited
     superclasses.
+
+    Protocols don't change once they're defined, so the result is cached for
+    as long as C{protocol} is alive.
     """
-    return (
-        frozenset(name for name, each in getmembers(protocol, isfunction))
-        - emptyProtocolMethods
-    )
+    try:
+        return _protocolMethodCache[protocol]
+    except KeyError:
+        cacheable = True
+    except TypeError:
+        # not weakly referenceable; just compute it every time.
+        cacheable = False
+    result = _definedFunctions(protocol) - emptyProtocolMethods  # type:ignore[arg-type]
+    if cacheable:
+        _protocolMethodCache[protocol] = result
+    return result
 
 
-def _fixAnnotation(method: Callable[..., object], it: object, ann: str) -> None:
-    annotation = getattr(it, ann)
+def _evaluated(method: Callable[..., object], annotation: object) -> object:
     if isinstance(annotation, str):
-        setattr(it, ann, eval(annotation, method.__globals__))
+        return eval(annotation, method.__globals__)
+    return annotation
+
+
+_signatureCache: WeakKeyDictionary[Callable[..., object], Signature] = (
+    WeakKeyDictionary()
+)
 
 
 def _liveSignature(method: Callable[..., object]) -> Signature:
     """
     Get a signature with evaluated annotations.
+
+    Signatures are cached for as long as C{method} is alive, so the returned
+    object is shared and must not be mutated.
     """
+    try:
+        return _signatureCache[method]
+    except KeyError:
+        cacheable = True
+    except TypeError:
+        # not weakly referenceable; just compute it every time.
+        cacheable = False
     # TODO: could this be replaced with get_type_hints?
     result = signature(method)
-    for param in result.parameters.values():
-        _fixAnnotation(method, param, "_annotation")
-    _fixAnnotation(method, result, "_return_annotation")
+    if isinstance(result.return_annotation, str) or any(
+        isinstance(param.annotation, str) for param in result.parameters.values()
+    ):
+        result = result.replace(
+            parameters=[
+                param.replace(annotation=_evaluated(method, param.annotation))
+                for param in result.parameters.values()
+            ],
+            return_annotation=_evaluated(method, result.return_annotation),
+        )
+    if cacheable:
+        _signatureCache[method] = result
     return result
@@ -1,3 +1,7 @@
+from __future__ import annotations
+
+import pickle
+from typing import Callable, Sequence
 from unittest import TestCase
 
 from .._core import Automaton, NoTransition, Transitioner
@@ -26,6 +30,10 @@ class CoreTests(TestCase):
         self.assertIn(state, str(noTransitionException))
         self.assertIn(symbol, str(noTransitionException))
 
+        unpickled = pickle.loads(pickle.dumps(noTransitionException))
+        self.assertEqual(unpickled.state, state)
+        self.assertEqual(unpickled.symbol, symbol)
+
     def test_unhandledTransition(self) -> None:
         """
         Automaton.unhandledTransition sets the outputs and end-state to be used
@@ -36,9 +44,101 @@ class CoreTests(TestCase):
         a.unhandledTransition("oops-state", ["oops-out"])
         t = Transitioner(a, "start")
         self.assertEqual(t.transition("check"), (tuple(["oops-out"]), None))
-        self.assertEqual(t.transition("check"), (["checked"], None))
+        self.assertEqual(t.transition("check"), (("checked",), None))
         self.assertEqual(t.transition("check"), (tuple(["oops-out"]), None))
 
+    def test_transitionerSeesNewTransitions(self) -> None:
+        """
+        A L{Transitioner} follows transitions added to its L{Automaton} after
+        it has already started transitioning, and can be moved to a state
+        that no transition mentions.
+        """
+        a: Automaton[str, str, str] = Automaton("start")
+        a.addTransition("start", "go", "middle", ("went",))
+        t = Transitioner(a, "start")
+        self.assertEqual(t.transition("go"), (("went",), None))
+        self.assertEqual(t._state, "middle")
+        a.addTransition("middle", "go", "end", ("arrived",))
+        self.assertEqual(t.transition("go"), (("arrived",), None))
+        self.assertEqual(t._state, "end")
+        t._state = "nowhere"
+        self.assertEqual(t._state, "nowhere")
+        with self.assertRaises(NoTransition):
+            t.transition("go")
+        with self.assertRaises(NoTransition):
+            t.transition("never-mentioned")
+
+    def test_transitionerLeavesAutomatonAlone(self) -> None:
+        """
+        Moving a L{Transitioner} to a state that no transition mentions, by
+        assignment or through an unhandled transition, doesn't change its
+        L{Automaton}, and the transitioner still follows transitions out of
+        that state if they are added later.
+        """
+        a: Automaton[str, str, str] = Automaton("start")
+        a.addTransition("start", "go", "middle", ("went",))
+        a.unhandledTransition("limbo", ["lost"])
+        numbered = list(a._indexedStates)
+        t = Transitioner(a, "start")
+        self.assertEqual(t.transition("stay"), (("lost",), None))
+        self.assertEqual(t._state, "limbo")
+        t._state = "nowhere"
+        self.assertEqual(t._state, "nowhere")
+        Transitioner(a, "elsewhere")
+        self.assertEqual(a._indexedStates, numbered)
+        a.addTransition("nowhere", "go", "start", ("returned",))
+        self.assertEqual(t.transition("go"), (("returned",), None))
+        self.assertEqual(t._state, "start")
+        self.assertEqual(t.transition("go"), (("went",), None))
+
+    def test_setTrace(self) -> None:
+        """
+        L{Transitioner.setTrace} installs a tracer that is called with each
+        transition's old state, input symbol and new state, until it is
+        replaced with C{None}.
+        """
+        a: Automaton[str, str, str] = Automaton("start")
+        a.addTransition("start", "go", "end", ("went",))
+        a.addTransition("end", "go", "start", ("came back",))
+        traces = []
+        t = Transitioner(a, "start")
+        t.setTrace(lambda *args: traces.append(args))
+        self.assertEqual(t.transition("go"), (("went",), None))
+        self.assertEqual(traces, [("start", "go", "end")])
+        t.setTrace(None)
+        self.assertEqual(t.transition("go"), (("came back",), None))
+        self.assertEqual(traces, [("start", "go", "end")])
+        self.assertEqual(t._state, "start")
+
+    def test_setTraceSubclass(self) -> None:
+        """
+        Setting and clearing a tracer on an instance of a L{Transitioner}
+        subclass leaves it an instance of that subclass.
+        """
+
+        class Counting(Transitioner[str, str, str]):
+            __slots__ = ()
+            count = 0
+
+            def _lookUpTransition(
+                self, inputSymbol: str
+            ) -> tuple[Sequence[str], Callable[[str], None] | None]:
+                Counting.count += 1
+                return super()._lookUpTransition(inputSymbol)
+
+        a: Automaton[str, str, str] = Automaton("start")
+        a.addTransition("start", "go", "start", ("went",))
+        traces = []
+        t = Counting(a, "start")
+        t.setTrace(lambda *args: traces.append(args))
+        self.assertIsInstance(t, Counting)
+        self.assertEqual(t.transition("go"), (("went",), None))
+        self.assertEqual((traces, Counting.count), ([("start", "go", "start")], 1))
+        t.setTrace(None)
+        self.assertIs(type(t), Counting)
+        self.assertEqual(t.transition("go"), (("went",), None))
+        self.assertEqual(len(traces), 1)
+
     def test_noOutputForInput(self):
         """
         L{Automaton.outputForInput} raises L{NoTransition} if no
@@ -58,9 +158,71 @@ class CoreTests(TestCase):
         a.addTransition("beginning", "begin", "ending", ["end"])
         self.assertEqual(a.inputAlphabet(), {"begin"})
         self.assertEqual(a.outputAlphabet(), {"end"})
-        self.assertEqual(a.outputForInput("beginning", "begin"), ("ending", ["end"]))
+        self.assertEqual(a.outputForInput("beginning", "begin"), ("ending", ("end",)))
         self.assertEqual(a.states(), {"beginning", "ending"})
 
+    def test_alphabetsTrackNewTransitions(self) -> None:
+        """
+        L{Automaton.allTransitions}, L{Automaton.inputAlphabet},
+        L{Automaton.outputAlphabet} and L{Automaton.states} reflect
+        transitions added after they were last queried.
+        """
+        a: Automaton[str, str, str] = Automaton()
+        a.addTransition("beginning", "begin", "middle", ("mid",))
+        self.assertEqual(
+            a.allTransitions(), {("beginning", "begin", "middle", ("mid",))}
+        )
+        self.assertEqual(a.inputAlphabet(), {"begin"})
+        self.assertEqual(a.outputAlphabet(), {"mid"})
+        self.assertEqual(a.states(), {"beginning", "middle"})
+        a.addTransition("middle", "finish", "ending", ("end", "done"))
+        self.assertEqual(
+            a.allTransitions(),
+            {
+                ("beginning", "begin", "middle", ("mid",)),
+                ("middle", "finish", "ending", ("end", "done")),
+            },
+        )
+        self.assertEqual(a.inputAlphabet(), {"begin", "finish"})
+        self.assertEqual(a.outputAlphabet(), {"mid", "end", "done"})
+        self.assertEqual(a.states(), {"beginning", "middle", "ending"})
+
+    def test_addTransitions(self) -> None:
+        """
+        L{Automaton.addTransitions} adds several transitions at once, or none
+        of them if any would duplicate an existing transition or another one
+        in the same batch.
+        """
+        a: Automaton[str, str, str] = Automaton("beginning")
+        a.addTransitions(
+            [
+                ("beginning", "begin", "middle", ["mid"]),
+                ("middle", "finish", "ending", ("end",)),
+            ]
+        )
+        self.assertEqual(a.outputForInput("beginning", "begin"), ("middle", ("mid",)))
+        self.assertEqual(a.outputForInput("middle", "finish"), ("ending", ("end",)))
+        self.assertRaises(
+            ValueError,
+            a.addTransitions,
+            [
+                ("ending", "restart", "beginning", ()),
+                ("middle", "finish", "beginning", ()),
+            ],
+        )
+        self.assertRaises(
+            ValueError,
+            a.addTransitions,
+            [
+                ("ending", "restart", "beginning", ()),
+                ("ending", "restart", "middle", ()),
+            ],
+        )
+        self.assertEqual(a.inputAlphabet(), {"begin", "finish"})
+        self.assertEqual(len(a.allTransitions()), 2)
+        transitioner = Transitioner(a, "beginning")
+        self.assertEqual(transitioner.transition("begin"), (("mid",), None))
+
     def test_oneTransition_nonIterableOutputs(self):
         """
         L{Automaton.addTransition} raises a TypeError when given outputs
@@ -93,5 +255,15 @@ class CoreTests(TestCase):
         with self.assertRaises(ValueError):
             a.initialState = "another state"
 
-
-# FIXME: addTransition for transition that's been added before
+    def test_duplicateTransition(self) -> None:
+        """
+        L{Automaton.addTransition} raises L{ValueError} when a transition for
+        the given state and input symbol has already been added, and leaves
+        the original transition in place.
+        """
+        a: Automaton[str, str, str] = Automaton()
+        a.addTransition("beginning", "begin", "ending", ("end",))
+        with self.assertRaises(ValueError) as raised:
+            a.addTransition("beginning", "begin", "elsewhere", ())
+        self.assertIn("ending", str(raised.exception))
+        self.assertEqual(a.outputForInput("beginning", "begin"), ("ending", ("end",)))
@@ -5,7 +5,13 @@ Tests for the public interface of Automat.
 from functools import reduce
 from unittest import TestCase
 
-from automat._methodical import ArgSpec, _getArgNames, _getArgSpec, _filterArgs
+from automat._methodical import (
+    ArgSpec,
+    _argFilter,
+    _getArgNames,
+    _getArgSpec,
+    _filterArgs,
+)
 from .. import MethodicalMachine, NoTransition
 from .. import _methodical
 
@@ -213,6 +219,39 @@ class MethodicalTests(TestCase):
             m.declaredInputName("too", "many", "arguments")
         self.assertIn("declaredInputName", str(cm.exception))
 
+    def test_inputMethodAttributes(self):
+        """
+        Input methods, whether accessed on an instance or on the class, have
+        the declared method's name and docstring, and each instance keeps
+        its own state.
+        """
+
+        class Mech(object):
+            m = MethodicalMachine()
+
+            @m.input()
+            def declaredInputName(self):
+                "an input"
+
+            @m.state(initial=True)
+            def aState(self):
+                "state"
+
+            @m.state()
+            def anotherState(self):
+                "another state"
+
+            aState.upon(declaredInputName, enter=anotherState, outputs=[])
+
+        first, second = Mech(), Mech()
+        for method in [first.declaredInputName, Mech.declaredInputName]:
+            self.assertEqual(method.__name__, "declaredInputName")
+            self.assertEqual(method.__doc__, "an input")
+        first.declaredInputName()
+        second.declaredInputName()
+        with self.assertRaises(NoTransition):
+            first.declaredInputName()
+
     def test_inputWithArguments(self):
         """
         If an input takes an argument, it will pass that along to its output.
@@ -514,6 +553,19 @@ class MethodicalTests(TestCase):
         argsOut, _ = _filterArgs(argsIn, {}, inputSpec, outputSpec)
         self.assertIs(argsIn, argsOut)
 
+    def test_argFilterDefaults(self):
+        """
+        The filter made by _argFilter() passes the input's default arguments
+        along to an output that accepts them, unless they were passed
+        positionally or by keyword.
+        """
+        inputSpec = _getArgSpec(lambda self, a, b=2, c=3: None)
+        outputSpec = _getArgSpec(lambda self, b, c: None)
+        argFilter = _argFilter(inputSpec, outputSpec)
+        self.assertEqual(argFilter((1,), {}), ([], {"b": 2, "c": 3}))
+        self.assertEqual(argFilter((1, 5), {}), ([5], {"c": 3}))
+        self.assertEqual(argFilter((1,), {"c": 4}), ([], {"b": 2, "c": 4}))
+
     def test_multipleInitialStatesFailure(self):
         """
         A L{MethodicalMachine} can only have one initial state.
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import pickle
+from copy import copy, deepcopy
 from dataclasses import dataclass
+from traceback import extract_tb
 from typing import Callable, Generic, List, Protocol, TypeVar
 from unittest import TestCase, skipIf
+from weakref import ref
 
 from .. import AlreadyBuiltError, NoTransition, TypeMachineBuilder, pep614
+from .._typed import DataOutput
 
 try:
     from zope.interface import Interface, implementer  # type:ignore[import-untyped]
@@ -111,6 +116,45 @@ class TypeMachineTests(TestCase):
         machine.change()
         self.assertEqual(machine.value(), 3)
 
+    def test_noInstanceDict(self) -> None:
+        """
+        Machines built by a L{TypeMachineBuilder} store their internals in
+        slots rather than an instance dictionary, but can still be weakly
+        referenced.
+        """
+        machine = machineFactory(NoOpCore())
+        self.assertFalse(hasattr(machine, "__dict__"))
+        self.assertIs(ref(machine)(), machine)
+
+    def test_copy(self) -> None:
+        """
+        Machines built by a L{TypeMachineBuilder}, and the outputs in their
+        automata, can be copied and pickled despite being slotted.
+        """
+        builder = TypeMachineBuilder(Counter, NoOpCore)
+        initial = builder.state("initial")
+        counting = builder.state("counting", lambda machine, core: Count())
+        initial.upon(Counter.start).to(counting).returns(None)
+
+        @pep614(counting.upon(Counter.increment).loop())
+        def incf(counter: Counter, core: NoOpCore, count: Count) -> None:
+            count.value += 1
+
+        @pep614(counting.upon(Counter.stop).to(initial))
+        def finish(counter: Counter, core: NoOpCore, count: Count) -> int:
+            return count.value
+
+        counter = builder.build()(NoOpCore())
+        counter.start()
+        counter.increment()
+        copied = deepcopy(counter)
+        copied.increment()
+        self.assertEqual((counter.stop(), copied.stop()), (1, 2))
+
+        output = DataOutput(Count)
+        self.assertEqual(copy(output), output)
+        self.assertEqual(pickle.loads(pickle.dumps(output)), output)
+
     def test_stateSpecificData(self) -> None:
 
         builder = TypeMachineBuilder(Counter, NoOpCore)
@@ -170,6 +214,104 @@ class TypeMachineTests(TestCase):
         machine.increment()
         self.assertEqual(machine.stop(), 1)
 
+    def test_inheritedProtocolMethods(self) -> None:
+        """
+        Methods that an input protocol inherits from another protocol are
+        implemented by the built machine along with its own methods.
+        """
+
+        class MoreMethods(ProtocolForTesting, Protocol):
+            def reset(self) -> None:
+                "Go back to the beginning."
+
+        builder = TypeMachineBuilder(MoreMethods, NoOpCore)
+        first = builder.state("first")
+        second = builder.state("second")
+        first.upon(MoreMethods.change).to(second).returns(None)
+        second.upon(MoreMethods.reset).to(first).returns(None)
+        first.upon(MoreMethods.value).loop().returns(1)
+        second.upon(MoreMethods.value).loop().returns(2)
+        machine = builder.build()(NoOpCore())
+        machine.change()
+        self.assertEqual(machine.value(), 2)
+        machine.reset()
+        self.assertEqual(machine.value(), 1)
+
+    def test_methodArguments(self) -> None:
+        """
+        Arguments to protocol methods, whether passed positionally or by
+        keyword, are passed along to state data factories and transition
+        implementations.  Calls that don't match the protocol method's
+        signature fail without changing the machine's state.
+        """
+
+        class Summer(Protocol):
+            def start(self, initial: int) -> None:
+                "Start summing."
+
+            def add(self, amount: int, result: int) -> None:
+                "Add C{amount} times C{result}."
+
+            def total(self) -> int:
+                "Get the total."
+
+        @dataclass
+        class Sum:
+            value: int
+
+        def startSum(proto: Summer, core: NoOpCore, initial: int) -> Sum:
+            return Sum(initial)
+
+        builder = TypeMachineBuilder(Summer, NoOpCore)
+        idle = builder.state("idle")
+        summing = builder.state("summing", startSum)
+        idle.upon(Summer.start).to(summing).returns(None)
+
+        @pep614(summing.upon(Summer.add).loop())
+        def add(
+            proto: Summer, core: NoOpCore, data: Sum, amount: int, result: int
+        ) -> None:
+            data.value += amount * result
+
+        @pep614(summing.upon(Summer.total).loop())
+        def total(proto: Summer, core: NoOpCore, data: Sum) -> int:
+            return data.value
+
+        machine = builder.build()(NoOpCore())
+        with self.assertRaises(TypeError):
+            machine.start()  # type:ignore[call-arg]
+        machine.start(1)
+        machine.add(2, 3)
+        machine.add(result=10, amount=4)
+        with self.assertRaises(TypeError):
+            machine.total(5)  # type:ignore[call-arg]
+        self.assertEqual(machine.total(), 47)
+
+    def test_implementationNames(self) -> None:
+        """
+        Calls to a machine's methods with the wrong arguments are reported in
+        terms of the protocol method, and tracebacks through the method's
+        implementation show its code.
+        """
+        with self.assertRaises(TypeError) as wrongArguments:
+            machineFactory(NoOpCore()).value(1)  # type:ignore[call-arg]
+        self.assertIn("value()", str(wrongArguments.exception))
+        self.assertNotIn("implementation", str(wrongArguments.exception))
+
+        builder = TypeMachineBuilder(SimpleProtocol, NoOpCore)
+
+        @pep614(builder.state("only").upon(SimpleProtocol.method).loop())
+        def fail(proto: SimpleProtocol, core: NoOpCore) -> None:
+            raise ValueError()
+
+        # assertRaises discards the traceback, so catch it here.
+        try:
+            builder.build()(NoOpCore()).method()
+        except ValueError as failure:
+            frames = extract_tb(failure.__traceback__)
+        [frame] = [frame for frame in frames if frame.name == "method"]
+        self.assertTrue(frame.line)
+
     def test_incompleteTransitionDefinition(self) -> None:
         builder = TypeMachineBuilder(SimpleProtocol, NoOpCore)
         sample = builder.state("sample")
@@ -1,8 +1,12 @@
 # -*- test-case-name: automat._test.test_type_based -*-
 from __future__ import annotations
 
+import linecache
 import sys
+from collections import deque
 from dataclasses import dataclass, field
+from inspect import Parameter
+from types import CodeType
 from typing import (
     TYPE_CHECKING,
     get_origin,
@@ -69,6 +73,15 @@ def pep614(t: R) -> R:
     return t
 
 
+def _returnsNone(*args: object, **kwargs: object) -> None:
+    """
+    The implementation of every transition declared with C{.returns(None)}.
+    """
+
+
+_returnsNone.__name__ = "returns(None)"
+
+
 @dataclass()
 class TransitionRegistrar(Generic[P, P1, R]):
     """
@@ -105,7 +118,7 @@ class TransitionRegistrar(Generic[P, P1, R]):
     _callback: Callable[P, R] | None = None
 
     def __post_init__(self) -> None:
-        self._old.builder._registrars.append(self)
+        self._old.builder._incomplete[id(self)] = self
 
     def __call__(self, impl: Callable[P, R]) -> Callable[P, R]:
         """
@@ -118,6 +131,7 @@ class TransitionRegistrar(Generic[P, P1, R]):
             )
         self._callback = impl
         builder = self._old.builder
+        del builder._incomplete[id(self)]
         assert builder is self._new.builder, "states must be from the same builder"
         builder._automaton.addTransition(
             self._old,
@@ -135,6 +149,11 @@ class TransitionRegistrar(Generic[P, P1, R]):
         the data-construction factory for the target state.
         """
 
+        if result is None:
+            # R is None here, but mypy can't narrow a type variable.
+            self(_returnsNone)  # type:ignore[arg-type]
+            return
+
         def constant(*args: object, **kwargs: object) -> R:
             return result
 
@@ -371,6 +390,14 @@ class InputImplementer(Generic[InputProtocol, Core]):
     When the factory returned from L{TypeMachine}
     """
 
+    __slots__ = (
+        "__automat_core__",
+        "__automat_transitioner__",
+        "__automat_data__",
+        "__automat_postponed__",
+        "__weakref__",
+    )
+
     __automat_core__: Core
     __automat_transitioner__: Transitioner[
         TypedState[InputProtocol, Core]
@@ -378,66 +405,217 @@ class InputImplementer(Generic[InputProtocol, Core]):
         str,
         SomeOutput,
     ]
-    __automat_data__: object | None = None
-    __automat_postponed__: list[Callable[[], None]] | None = None
+    __automat_data__: object | None
+    __automat_postponed__: (
+        deque[tuple[Callable[..., object], tuple[object, ...], dict[str, object]]]
+        | tuple[()]
+        | None
+    )
+
+
+_implementationSource = """\
+def implementation({parameters}):
+    transitioner = {self}.__automat_transitioner__
+    dataAtStart = {self}.__automat_data__
+    if {self}.__automat_postponed__ is not None:
+{reentry}
+    {self}.__automat_postponed__ = running
+    try:
+        [outputs, tracer] = transitioner._transitionByIndex(inputIndex)
+        if len(outputs) == 1:
+            # most transitions have exactly one output; skip the loop.
+            result = outputs[0]({self}, dataAtStart, {outputArguments})
+        else:
+            result = None
+            for output in outputs:
+                # here's the idea: there will be a state-setup output and a
+                # state-teardown output. state-setup outputs are added to the
+                # *beginning* of any entry into a state, so that by the time
+                # you are running the *implementation* of a method that has
+                # entered that state, the protocol is in a self-consistent
+                # state and can run reentrant outputs.  not clear that
+                # state-teardown outputs are necessary
+                result = output({self}, dataAtStart, {outputArguments})
+    finally:
+        postponed = {self}.__automat_postponed__
+        {self}.__automat_postponed__ = None
+    while postponed:
+        queuedImplementation, queuedArgs, queuedKwargs = postponed.popleft()
+        queuedImplementation(*queuedArgs, **queuedKwargs)
+    return result
+"""
+
+# What L{_implementationSource} does when called reentrantly: methods that
+# return None have their calls postponed until the current one is finished;
+# anything else can't be, since its result would be needed immediately.  While
+# a call is running, __automat_postponed__ is the empty tuple C{running} until
+# something is actually postponed, so that calls which aren't reentered don't
+# need to allocate a queue.
+_postponeSource = """\
+        if {self}.__automat_postponed__ is running:
+            {self}.__automat_postponed__ = deque()
+        {self}.__automat_postponed__.append((implementation, {queued}))
+        return None"""
+_refuseSource = """\
+        raise RuntimeError(reentrantMessage)"""
+
+# Every name that _implementationSource uses for something other than the
+# protocol method's parameters.
+_implementationNames = frozenset(
+    [
+        "implementation",
+        "transitioner",
+        "dataAtStart",
+        "RuntimeError",
+        "reentrantMessage",
+        "deque",
+        "running",
+        "postponed",
+        "queuedImplementation",
+        "queuedArgs",
+        "queuedKwargs",
+        "outputs",
+        "len",
+        "tracer",
+        "inputIndex",
+        "result",
+        "output",
+    ]
+)
+
+
+def _implementationParameters(method: Callable[..., object]) -> dict[str, str]:
+    """
+    Compute the values to fill in to L{_implementationSource} for C{method}.
+
+    If C{method} only takes required positional parameters (as most protocol
+    methods do), the implementation takes exactly the same parameters, and
+    passes them along to each output without packing them into C{*args} and
+    C{**kwargs}.  Otherwise, it takes C{*args} and C{**kwargs}, so that
+    arguments the caller omitted are left for each output's own defaults.
+    """
+    parameters = list(_liveSignature(method).parameters.values())
+    names = [parameter.name for parameter in parameters]
+    positional = (Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD)
+    if (
+        names
+        and all(
+            parameter.kind in positional and parameter.default is Parameter.empty
+            for parameter in parameters
+        )
+        and _implementationNames.isdisjoint(names)
+    ):
+        declared = names[:]
+        positionalOnly = sum(
+            parameter.kind is Parameter.POSITIONAL_ONLY for parameter in parameters
+        )
+        if positionalOnly:
+            declared.insert(positionalOnly, "/")
+        return dict(
+            parameters=", ".join(declared),
+            self=names[0],
+            queued=f"({', '.join(names)},), {{}}",
+            outputArguments=", ".join(names[1:]),
+        )
+    return dict(
+        parameters="self, /, *args, **kwargs",
+        self="self",
+        queued="(self, *args), kwargs",
+        outputArguments="*args, **kwargs",
+    )
+
+
+# Compiled implementations, keyed by their source; protocols tend to have many
+# methods with the same shape of parameter list, and every build of a protocol
+# has the same ones.
+_implementationCode: dict[str, CodeType] = {}
+
+
+def _compiledImplementation(source: str) -> CodeType:
+    """
+    Compile C{source}, a filled-in L{_implementationSource}, or reuse the code
+    from a previous compilation of the same source.
+
+    Each distinct source gets its own file name, registered with L{linecache},
+    so that tracebacks through an implementation can show its code.
+    """
+    code = _implementationCode.get(source)
+    if code is None:
+        filename = f"<automat implementation {len(_implementationCode)}>"
+        linecache.cache[filename] = (
+            len(source),
+            None,
+            source.splitlines(True),
+            filename,
+        )
+        code = _implementationCode[source] = compile(source, filename, "exec")
+    return code
 
 
 def implementMethod(
     method: Callable[..., object],
+    inputIndex: int,
 ) -> Callable[..., object]:
     """
     Construct a function for populating in the synthetic provider of the Input
     Protocol to a L{TypeMachineBuilder}.  It should have a signature matching that
     of the C{method} parameter, a function from that protocol.
+
+    C{inputIndex} is the number of C{method}'s name in the automaton's dispatch
+    table, so that it need not be looked up on every call.
     """
-    methodInput = method.__name__
     # side-effects can be re-ordered until later.  If you need to compute a
     # value in your method, then obviously it can't be invoked reentrantly.
     returnAnnotation = _liveSignature(method).return_annotation
-    returnsNone = returnAnnotation is None
-
-    def implementation(
-        self: InputImplementer[InputProtocol, Core], *args: object, **kwargs: object
-    ) -> object:
-        transitioner = self.__automat_transitioner__
-        dataAtStart = self.__automat_data__
-        if self.__automat_postponed__ is not None:
-            if not returnsNone:
-                raise RuntimeError(
-                    f"attempting to reentrantly run {method.__qualname__} "
-                    f"but it wants to return {returnAnnotation!r} not None"
-                )
-
-            def rerunme() -> None:
-                implementation(self, *args, **kwargs)
-
-            self.__automat_postponed__.append(rerunme)
-            return None
-        postponed = self.__automat_postponed__ = []
-        try:
-            [outputs, tracer] = transitioner.transition(methodInput)
-            result: Any = None
-            for output in outputs:
-                # here's the idea: there will be a state-setup output and a
-                # state-teardown output. state-setup outputs are added to the
-                # *beginning* of any entry into a state, so that by the time you
-                # are running the *implementation* of a method that has entered
-                # that state, the protocol is in a self-consistent state and can
-                # run reentrant outputs.  not clear that state-teardown outputs are
-                # necessary
-                result = output(self, dataAtStart, *args, **kwargs)
-        finally:
-            self.__automat_postponed__ = None
-        while postponed:
-            postponed.pop(0)()
-        return result
-
-    implementation.__qualname__ = implementation.__name__ = (
-        f"<implementation for {method}>"
+    namespace: dict[str, Any] = dict(
+        deque=deque,
+        running=(),
+        inputIndex=inputIndex,
+        reentrantMessage=(
+            f"attempting to reentrantly run {method.__qualname__} "
+            f"but it wants to return {returnAnnotation!r} not None"
+        ),
+    )
+    parameters = _implementationParameters(method)
+    reentry = _postponeSource if returnAnnotation is None else _refuseSource
+    source = _implementationSource.format(
+        reentry=reentry.format(**parameters), **parameters
     )
+    exec(_compiledImplementation(source), namespace)
+    implementation: Callable[..., object] = namespace["implementation"]
+    # Take the protocol method's name, so that it, rather than the shared
+    # generated code, is what errors about its arguments and tracebacks
+    # through it refer to.
+    implementation.__name__ = method.__name__
+    implementation.__qualname__ = method.__qualname__
+    if sys.version_info >= (3, 11):
+        implementation.__code__ = implementation.__code__.replace(
+            co_name=method.__name__, co_qualname=method.__qualname__
+        )
+    else:
+        implementation.__code__ = implementation.__code__.replace(
+            co_name=method.__name__
+        )
     return implementation
 
 
+def _getSlotsState(self: Any) -> list[object]:
+    """
+    C{__getstate__} for a frozen dataclass with C{__slots__}, as
+    C{dataclass(slots=True)} would generate.
+    """
+    return [getattr(self, name) for name in type(self).__slots__]
+
+
+def _setSlotsState(self: Any, state: list[object]) -> None:
+    """
+    C{__setstate__} for a frozen dataclass with C{__slots__}, which can't use
+    the default, since that sets each slot with C{setattr}.
+    """
+    for name, value in zip(type(self).__slots__, state):
+        object.__setattr__(self, name, value)
+
+
 @dataclass(frozen=True)
 class MethodOutput(Generic[Core]):
     """
@@ -448,10 +626,15 @@ class MethodOutput(Generic[Core]):
     initially.
     """
 
+    __slots__ = ("method", "requiresData", "_assertion")
+
     method: Callable[..., Any]
     requiresData: bool
     _assertion: Callable[[object], None]
 
+    __getstate__ = _getSlotsState
+    __setstate__ = _setSlotsState
+
     @classmethod
     def _fromImpl(
         cls: type[MethodOutput[Core]], method: Callable[..., Any], requiresData: bool
@@ -512,15 +695,16 @@ class MethodOutput(Generic[Core]):
         *args: object,
         **kwargs: object,
     ) -> object:
-        extraArgs = [machine, machine.__automat_core__]
-        if self.requiresData:
-            self._assertion(dataAtStart)
-            extraArgs += [dataAtStart]
         # if anything is invoked reentrantly here, then we can't possibly have
         # set __automat_data__ and the data argument to the reentrant method
         # will be wrong.  we *need* to split out the construction / state-enter
         # hook, because it needs to run separately.
-        return self.method(*extraArgs, *args, **kwargs)
+        if self.requiresData:
+            self._assertion(dataAtStart)
+            return self.method(
+                machine, machine.__automat_core__, dataAtStart, *args, **kwargs
+            )
+        return self.method(machine, machine.__automat_core__, *args, **kwargs)
 
 
 @dataclass(frozen=True)
@@ -529,8 +713,13 @@ class DataOutput(Generic[Data]):
     Construct an output for the given data objects.
     """
 
+    __slots__ = ("dataFactory",)
+
     dataFactory: Callable[..., Data]
 
+    __getstate__ = _getSlotsState
+    __setstate__ = _setSlotsState
+
     @property
     def name(self) -> str:
         return f"data:{self.dataFactory.__name__}"
@@ -605,7 +794,7 @@ class TypeMachine(Generic[InputProtocol, Core]):
             initial = state
 
         internals: InputImplementer[InputProtocol, Core] = self.__automat_type__(
-            core, txnr := Transitioner(self.__automat_automaton__, initial)
+            core, txnr := Transitioner(self.__automat_automaton__, initial), None, None
         )
         result: InputProtocol = internals  # type:ignore[assignment]
 
@@ -662,8 +851,10 @@ class TypeMachineBuilder(Generic[InputProtocol, Core]):
         SomeOutput,
     ] = field(default_factory=Automaton, repr=False, init=False)
     _initial: bool = field(default=True, init=False)
-    _registrars: list[TransitionRegistrar[..., ..., Any]] = field(
-        default_factory=list, init=False
+    # Transitions that have been declared but not yet given an implementation
+    # or return value, keyed by id() since registrars aren't hashable.
+    _incomplete: dict[int, TransitionRegistrar[..., ..., Any]] = field(
+        default_factory=dict, init=False
     )
     _built: bool = field(default=False, init=False)
 
@@ -707,20 +898,22 @@ class TypeMachineBuilder(Generic[InputProtocol, Core]):
             raise AlreadyBuiltError("Cannot build a state machine twice.")
         self._built = True
 
-        for registrar in self._registrars:
+        for registrar in self._incomplete.values():
             registrar._checkComplete()
 
-        # We were only hanging on to these for error-checking purposes, so we
-        # can drop them now.
-        del self._registrars[:]
-
+        namespace: dict[str, object] = {
+            method_name: implementMethod(
+                getattr(self.inputProtocol, method_name),
+                self._automaton._inputIndexOf(method_name),
+            )
+            for method_name in actuallyDefinedProtocolMethods(self.inputProtocol)
+        }
+        # Like InputImplementer itself, instances have no __dict__.
+        namespace["__slots__"] = ()
         runtimeType: type[InputImplementer[InputProtocol, Core]] = type(
             f"Typed<{runtime_name(self.inputProtocol)}>",
             tuple([InputImplementer]),
-            {
-                method_name: implementMethod(getattr(self.inputProtocol, method_name))
-                for method_name in actuallyDefinedProtocolMethods(self.inputProtocol)
-            },
+            namespace,
         )
 
         return TypeMachine(runtimeType, self._automaton)